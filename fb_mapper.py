@@ -4,32 +4,44 @@ Maps a lightweight "simple mode" CSV into Facebook Ads Manager bulk-import forma
 Implements defaults, validation, and conflict resolution per spec.
 """
 from __future__ import annotations
+import re
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Tuple
-from datetime import datetime
 
 VALID = {
-    "status": {"ACTIVE", "PAUSED", "ARCHIVED", "DELETED"},
-    "objectives": {
+    "status": frozenset({"ACTIVE", "PAUSED", "ARCHIVED", "DELETED"}),
+    "objectives": frozenset({
         "Traffic", "Leads", "Conversions", "Sales", "Video Views", "Reach", 
         "Engagement", "App Installs", "Brand Awareness", "Messages"
-    },
-    "buying_type": {"AUCTION", "FIXED_PRICE"},
-    "bid_strategies": {"Lowest cost", "Cost cap", "ROAS goal", "Bid cap"},
-    "cta": {
+    }),
+    "buying_type": frozenset({"AUCTION", "FIXED_PRICE"}),
+    "bid_strategies": frozenset({"Lowest cost", "Cost cap", "ROAS goal", "Bid cap"}),
+    "cta": frozenset({
         "LEARN_MORE", "SIGN_UP", "GET_QUOTE", "SHOP_NOW", "SUBSCRIBE", 
         "APPLY_NOW", "CONTACT_US", "BOOK_NOW", "DOWNLOAD", "GET_DIRECTIONS"
-    },
-    "gender": {"All", "Male", "Female"},
-    "placements": {
+    }),
+    "gender": frozenset({"All", "Male", "Female"}),
+    "placements": frozenset({
         "facebook", "instagram", "audience_network", "messenger",
         "feed", "stories", "reels", "instream_video", "marketplace"
-    },
-    "special_categories": {
+    }),
+    "special_categories": frozenset({
         "CREDIT", "EMPLOYMENT", "HOUSING", "SOCIAL_ISSUES", "POLITICS"
-    }
+    })
 }
 
+# Module-level bindings for the hot validation paths
+_STATUS = VALID["status"]
+_OBJECTIVES = VALID["objectives"]
+_BUYING_TYPE = VALID["buying_type"]
+_BID_STRATEGIES = VALID["bid_strategies"]
+_CTA = VALID["cta"]
+_GENDER = VALID["gender"]
+
+# Lower-cased gender spellings → Meta's values
+_GENDER_MAP = {"all": "All", "male": "Male", "female": "Female", "m": "Male", "f": "Female"}
+
 # Objective → default optimisation + CTA mapping
 OBJ_DEFAULTS = {
     "Leads": {"optimisation": "LEAD_GENERATION", "cta": "SIGN_UP"},
@@ -44,137 +56,233 @@ OBJ_DEFAULTS = {
     "Messages": {"optimisation": "CONVERSATIONS", "cta": "CONTACT_US"}
 }
 
-def _coerce_time(val: Any) -> str:
-    """Convert various time formats to YYYY-MM-DD HH:MM format."""
-    if pd.isna(val) or val == "":
-        return ""
+# Per-field views of OBJ_DEFAULTS for column-wide Series.map lookups
+OBJ_CTA = {k: v["cta"] for k, v in OBJ_DEFAULTS.items()}
+OBJ_OPT = {k: v["optimisation"] for k, v in OBJ_DEFAULTS.items()}
+
+# Campaign columns: propagated down to adset rows and written first in the output
+CAMPAIGN_COLUMNS = [
+    "Campaign Name", "Campaign Status", "Special Ad Categories", 
+    "Special Ad Category Country", "Campaign Objective", "Buying Type", 
+    "Campaign Bid Strategy", "Campaign Daily Budget", "Campaign Start Time", 
+    "Campaign Stop Time"
+]
+
+# Output column order for Meta Ads Manager compatibility
+OUTPUT_COLUMNS = CAMPAIGN_COLUMNS + [
+    # Ad Set
+    "Ad Set Name", "Ad Set Run Status", "Ad Set Daily Budget", 
+    "Ad Set Time Start", "Ad Set Time Stop", "Countries", "Age Min", "Age Max", 
+    "Gender", "Custom Audiences", "Excluded Custom Audiences", 
+    "Saved Audiences", "Excluded Saved Audiences", "Optimisation Goal", 
+    "Publisher Platforms",
     
-    try:
-        # Handle common formats
-        if isinstance(val, str):
-            val = val.strip()
-            # Handle "YYYY-MM-DD HH:MM" format
-            if len(val) == 16 and val[10] == ' ':
-                return datetime.strptime(val, "%Y-%m-%d %H:%M").strftime("%Y-%m-%d %H:%M")
-            # Handle "YYYY-MM-DD" format - add default time
-            if len(val) == 10:
-                return f"{val} 00:00"
-        
-        # Use pandas to parse and normalise
-        dt = pd.to_datetime(val, utc=False, errors="raise")
-        return dt.strftime("%Y-%m-%d %H:%M")
-    except Exception:
-        raise ValueError(f"Invalid time format: {val}. Use YYYY-MM-DD HH:MM or YYYY-MM-DD")
+    # Ad/Creative
+    "Ad Name", "Ad Status", "Headline", "Primary Text", "Description", 
+    "Link", "URL Tags", "Call to Action", "Image File Name"
+]
+
+# Free-text input columns, blank-filled and stripped up-front so helpers only compare against ""
+TEXT_COLUMNS = [
+    "Input Level", "Campaign Name", "Special Ad Categories", "Special Ad Category Country",
+    "Ad Set Name", "Countries", "Gender", "Custom Audiences", "Excluded Custom Audiences",
+    "Saved Audiences", "Excluded Saved Audiences", "Optimisation Goal", "Ad Name",
+    "Headline", "Primary Text", "Description", "Link", "URL Tags", "Image File Name"
+]
+
+# Numeric input columns, coerced up-front (blank → NaN)
+AGE_COLUMNS = ["Age Min", "Age Max"]
+
+# Every column transform() reads; ones missing from the input are treated as blank
+INPUT_COLUMNS = list(dict.fromkeys(
+    TEXT_COLUMNS + AGE_COLUMNS + CAMPAIGN_COLUMNS + [
+        "Ad Set Run Status", "Ad Set Daily Budget", "Ad Set Time Start", "Ad Set Time Stop",
+        "Ad Status", "Call to Action"
+    ]
+))
+
+# Default URL tags, using Meta's dynamic parameters
+UTM_DEFAULT = "utm_source=meta&utm_medium=cpc&utm_campaign={{campaign.name}}&utm_content={{adset.name}}"
+
+# Times already in the output format skip format inference and reformatting
+_ISO_MINUTE = re.compile(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}")
+
+# Trailing UTC offset on a clock time ("Z", "+01:00", "-0500"); dropped so each
+# value keeps its own wall-clock time and mixed offsets don't clash
+_TZ_SUFFIX = re.compile(r"(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)\s*(?:[zZ]|UTC|[+-]\d{2}(?::?\d{2})?)$")
 
-def _pos_number(val: Any, allow_blank=True) -> str:
-    """Convert to positive number, handling blanks appropriately."""
-    if pd.isna(val) or str(val).strip() == "":
-        return "" if allow_blank else "1"
-    try:
-        v = float(val)
-        if v <= 0:
-            raise ValueError("must be > 0")
-        # Return as integer for budgets (Meta expects whole numbers)
-        return str(int(round(v)))
-    except (ValueError, TypeError):
-        raise ValueError(f"Invalid positive number: {val}")
+# URL tags must carry at least one utm_<key>=<value> pair
+_UTM_PAIR = re.compile(r"utm_\w+=")
 
-def _enum(val: Any, allowed: set, field: str, default: str = "") -> str:
-    """Validate value against allowed set."""
-    if pd.isna(val) or val == "":
-        return default
-    s = str(val).strip()
-    if s not in allowed:
-        raise ValueError(f"{field}: '{s}' not in {sorted(allowed)}")
-    return s
+# Enum columns validated up-front: (column, allowed values, default, levels checked)
+ENUM_COLUMNS = [
+    ("Campaign Status", _STATUS, "ACTIVE", {"campaign", "adset"}),
+    ("Campaign Objective", _OBJECTIVES, "", {"campaign", "adset"}),
+    ("Buying Type", _BUYING_TYPE, "AUCTION", {"campaign", "adset"}),
+    ("Campaign Bid Strategy", _BID_STRATEGIES, "Lowest cost", {"campaign", "adset"}),
+    ("Ad Set Run Status", _STATUS, "ACTIVE", {"adset"}),
+    ("Ad Status", _STATUS, "ACTIVE", {"adset"}),
+    ("Call to Action", _CTA, "", {"adset"}),
+]
 
-def _gender(val: Any) -> str:
-    """Handle gender field with proper defaults."""
-    if pd.isna(val) or val == "":
-        return "All"
-    s = str(val).strip().title()
-    if s not in VALID["gender"]:
-        raise ValueError(f"Gender: '{val}' must be one of {sorted(VALID['gender'])}")
-    return s
+# Time columns normalised up-front: (column, levels checked)
+TIME_COLUMNS = [
+    ("Campaign Start Time", {"campaign", "adset"}),
+    ("Campaign Stop Time", {"campaign", "adset"}),
+    ("Ad Set Time Start", {"adset"}),
+    ("Ad Set Time Stop", {"adset"}),
+]
 
-def _age_pair(minv: Any, maxv: Any, special_categories: str = "") -> Tuple[str, str]:
-    """Handle age pair with Meta's minimum age requirements."""
+def _parse_one(value: str) -> pd.Timestamp:
+    """Parse a single time to its wall-clock value, NaT when unparseable."""
+    ts = pd.to_datetime(value, errors="coerce")
+    return ts.tz_localize(None) if ts is not pd.NaT and ts.tzinfo else ts
+
+def _coerce_time(col: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Convert a whole time column to YYYY-MM-DD HH:MM; returns (values, bad mask)."""
+    s = col.astype("string").str.strip().fillna("")
+    blank = s.eq("")
+    values = pd.Series("", index=s.index, dtype="string")
+    
+    # Values already in output shape are kept as typed; the exact-format
+    # parse only confirms they are real dates
+    ready = s.str.fullmatch(_ISO_MINUTE)
+    if ready.any():
+        real = pd.to_datetime(s.where(ready), errors="coerce", format="%Y-%m-%d %H:%M").notna()
+        values[ready & real] = s[ready & real]
+    
+    # One ISO pass covers "YYYY-MM-DD" and other ISO shapes; only the rest
+    # fall back to pandas' per-value format inference
+    rest = ~blank & ~ready
+    if rest.any():
+        naive = s[rest].str.replace(_TZ_SUFFIX, r"\1", regex=True)
+        dt = pd.to_datetime(naive, errors="coerce", format="ISO8601")
+        retry = dt.isna()
+        if retry.any():
+            try:
+                redo = pd.to_datetime(naive[retry], errors="coerce", format="mixed")
+                # Zone names the suffix pattern leaves ("GMT", "GMT+1") come back
+                # tz-aware; drop the zone but keep the wall-clock time
+                if isinstance(redo.dtype, pd.DatetimeTZDtype):
+                    redo = redo.dt.tz_localize(None)
+                elif not pd.api.types.is_datetime64_dtype(redo.dtype):
+                    raise TypeError("mixed timezones")  # pandas 2 returns objects here
+            except (ValueError, TypeError):
+                # Mixed zones raise (pandas 3) or stay as objects (pandas 2) even
+                # with errors="coerce"; parse those one by one
+                redo = pd.to_datetime(naive[retry].map(_parse_one))
+            dt[retry] = redo
+        values[rest] = dt.dt.strftime("%Y-%m-%d %H:%M").fillna("")
+    
+    bad = (~blank & values.eq("")).to_numpy(dtype=bool)
+    return values, bad
+
+def _pos_number(col: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Convert a whole column to positive whole numbers; returns (values, bad mask)."""
+    s = col.astype("string").str.strip().fillna("")
+    blank = s.eq("")
+    n = pd.to_numeric(s.where(~blank), errors="coerce").astype("float64")
+    bad = (~blank & ~(n.gt(0) & np.isfinite(n))).to_numpy(dtype=bool)
+    # Whole numbers for budgets (Meta expects them); bad rows keep their raw text
+    ok = ~blank & ~bad
+    whole = n[ok].round()
+    # int64 covers every real budget; anything larger is spelled out via Python ints
+    big = whole.ge(2**63)
+    text = whole.where(~big, 0).astype("int64").astype(str)
+    text = text.mask(big, whole[big].map(lambda v: str(int(v))))
+    return s.mask(ok, text), bad
+
+def _enum(col: pd.Series, allowed: frozenset, default: str = "") -> Tuple[pd.Series, np.ndarray]:
+    """Validate a whole column against allowed set; returns (categorical values, bad mask)."""
+    s = col.astype("string").str.strip().fillna("")
+    blank = s.eq("")
+    bad = ~blank & ~s.isin(allowed)
+    # Only valid values reach the categorical; bad ones are left as NaN
+    values = s.where(~blank, default).where(~bad).astype(
+        pd.CategoricalDtype(sorted(allowed | {default}))
+    )
+    return values, bad.to_numpy(dtype=bool)
+
+def _gender(col: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Normalise a whole (stripped) gender column, blank → All; returns (values, bad mask)."""
+    given = col.ne("")
+    mapped = col.str.lower().map(_GENDER_MAP)
+    bad = (given & mapped.isna()).to_numpy(dtype=bool)
+    return mapped.where(given, "All").fillna(""), bad
+
+def _age_pair(minv: pd.Series, maxv: pd.Series, special_categories: pd.Series) -> Tuple[pd.Series, pd.Series, np.ndarray]:
+    """Handle whole age columns with Meta's minimum age requirements; returns (min, max, bad mask)."""
     # Meta's minimum age is 13, but 18+ for special ad categories and many countries
-    min_allowed = 13
+    min_allowed = np.where(special_categories.ne(""), 18, 13)
     max_allowed = 65
     
-    # Special ad categories require 18+ minimum
-    if special_categories and str(special_categories).strip():
-        min_allowed = 18
+    # Blank values (already coerced to NaN) take the allowed bounds
+    min_age = np.trunc(np.where(minv.isna(), min_allowed, minv))
+    max_age = np.trunc(np.where(maxv.isna(), max_allowed, maxv))
     
-    # Handle blank values
-    if pd.isna(minv) and pd.isna(maxv):
-        return str(min_allowed), str(max_allowed)
+    # Validate logical constraints
+    bad = min_age > max_age
     
-    try:
-        # Parse values
-        min_age = int(minv) if not pd.isna(minv) and str(minv).strip() else min_allowed
-        max_age = int(maxv) if not pd.isna(maxv) and str(maxv).strip() else max_allowed
-        
-        # Validate logical constraints
-        if min_age > max_age:
-            raise ValueError(f"Age Min ({min_age}) must be ≤ Age Max ({max_age})")
-        
-        # Enforce Meta platform constraints
-        if min_age < min_allowed:
-            min_age = min_allowed
-        if max_age > max_allowed:
-            max_age = max_allowed
-            
-        return str(min_age), str(max_age)
-        
-    except (ValueError, TypeError):
-        raise ValueError(f"Invalid age pair: Min={minv}, Max={maxv}. Must be integers between {min_allowed}-{max_allowed}")
+    # Enforce Meta platform constraints
+    min_age = np.clip(min_age, min_allowed, max_allowed).astype(int)
+    max_age = np.clip(max_age, min_allowed, max_allowed).astype(int)
+    
+    return (
+        pd.Series(min_age, index=minv.index).astype(str),
+        pd.Series(max_age, index=maxv.index).astype(str),
+        bad,
+    )
 
-def _default_cta(objective: str, cta: str) -> str:
-    """Get CTA with objective-based defaults."""
-    if cta and str(cta).strip():
-        return _enum(cta, VALID["cta"], "Call to Action")
-    if objective in OBJ_DEFAULTS:
-        return OBJ_DEFAULTS[objective]["cta"]
-    return "LEARN_MORE"
+def _default_cta(objective: pd.Series, cta: pd.Series) -> pd.Series:
+    """Get CTA column with objective-based defaults (values already validated)."""
+    cta = cta.astype(object)
+    return cta.where(cta.ne(""), objective.astype(object).map(OBJ_CTA).fillna("LEARN_MORE"))
 
-def _default_opt_goal(objective: str, goal: str) -> str:
-    """Get optimisation goal with objective-based defaults."""
-    if goal and str(goal).strip():
-        return str(goal).strip()
-    if objective in OBJ_DEFAULTS:
-        return OBJ_DEFAULTS[objective]["optimisation"]
-    return "LINK_CLICKS"  # Safe default
+def _default_opt_goal(objective: pd.Series, goal: pd.Series) -> pd.Series:
+    """Get optimisation goal column with objective-based defaults."""
+    return goal.where(goal.ne(""), objective.astype(object).map(OBJ_OPT).fillna("LINK_CLICKS"))  # Safe default
 
-def _process_utm_parameters(link: str, utm_params: str, campaign_name: str = "", adset_name: str = "") -> Tuple[str, str]:
+def _process_utm_parameters(link: pd.Series, utm_params: pd.Series, campaign_name: pd.Series, adset_name: pd.Series) -> Tuple[pd.Series, pd.Series, np.ndarray]:
     """
-    Process link and UTM parameters with Meta dynamic parameter support.
+    Process link and UTM parameter columns with Meta dynamic parameter support.
     UTM parameters should be proper query string format.
+    Inputs are the stripped text columns; returns (links, url_tags, bad mask).
     """
-    if pd.isna(link) or str(link).strip() == "":
-        return "", ""
+    has_link = link.ne("")
+    clean_utm = utm_params.copy()
     
-    clean_link = str(link).strip()
+    # Replace any manual campaign/adset name placeholders (only rows that use them)
+    for placeholder, names in (("{campaign_name}", campaign_name), ("{adset_name}", adset_name)):
+        rows = has_link & clean_utm.str.contains(placeholder, regex=False) & names.ne("")
+        if rows.any():
+            slugs = names[rows].str.lower().str.replace(" ", "_", regex=False)
+            replaced = pd.Series(
+                [u.replace(placeholder, slug) for u, slug in zip(clean_utm[rows], slugs)],
+                index=slugs.index,
+            )
+            clean_utm = clean_utm.mask(rows, replaced)
     
-    if pd.isna(utm_params) or str(utm_params).strip() == "":
-        # Generate default UTM parameters with Meta dynamic params
-        utm_default = "utm_source=meta&utm_medium=cpc&utm_campaign={{campaign.name}}&utm_content={{adset.name}}"
-        return clean_link, utm_default
+    # Validate UTM format (at least one utm_key=value pair)
+    bad = (has_link & clean_utm.ne("") & ~clean_utm.str.contains(_UTM_PAIR)).to_numpy(dtype=bool)
     
-    clean_utm = str(utm_params).strip()
-    
-    # Replace any manual campaign/adset name placeholders if provided
-    if campaign_name:
-        clean_utm = clean_utm.replace("{campaign_name}", campaign_name.lower().replace(" ", "_"))
-    if adset_name:
-        clean_utm = clean_utm.replace("{adset_name}", adset_name.lower().replace(" ", "_"))
-    
-    # Validate UTM format (basic check for key=value pairs)
-    if not ('=' in clean_utm and 'utm_' in clean_utm):
-        raise ValueError(f"Invalid UTM format: '{clean_utm}'. Expected format: utm_source=meta&utm_medium=cpc&utm_campaign={{{{campaign.name}}}}")
-    
-    return clean_link, clean_utm
+    # Blank URL tags get the default; rows without a link carry no tags at all
+    clean_utm = clean_utm.where(clean_utm.ne(""), UTM_DEFAULT).where(has_link, "")
+    return link, clean_utm, bad
+
+def _campaign_output(d: pd.DataFrame) -> Dict[str, Any]:
+    """Campaign-level output columns for a batch of rows, in CAMPAIGN_COLUMNS order."""
+    return {
+        "Campaign Name": d["Campaign Name"],
+        "Campaign Status": d["Campaign Status"],
+        "Special Ad Categories": d["Special Ad Categories"],
+        "Special Ad Category Country": d["Special Ad Category Country"],
+        "Campaign Objective": d["Campaign Objective"],
+        "Buying Type": d["Buying Type"],
+        "Campaign Bid Strategy": d["Campaign Bid Strategy"],
+        "Campaign Daily Budget": d["Campaign Daily Budget"],
+        "Campaign Start Time": d["Campaign Start Time"],
+        "Campaign Stop Time": d["Campaign Stop Time"],
+    }
 
 def transform(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
@@ -186,217 +294,156 @@ def transform(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     
     Returns: (output_df, errors_df)
     """
-    errors = []
-    rows = []
-
-    # Create copy and forward-fill campaign-level values
-    df_ff = df.copy()
-    
-    # Campaign columns that should propagate down to adset rows
-    campaign_cols = [
-        "Campaign Name", "Campaign Status", "Special Ad Categories", 
-        "Special Ad Category Country", "Campaign Objective", "Buying Type", 
-        "Campaign Bid Strategy", "Campaign Daily Budget", "Campaign Start Time", 
-        "Campaign Stop Time"
-    ]
-    
-    # Forward fill campaign values
-    for col in campaign_cols:
-        if col in df_ff.columns:
-            df_ff[col] = df_ff[col].ffill()
+    err_rows, err_fields, err_msgs = [], [], []
 
-    # Process each row
-    for idx, row in df_ff.iterrows():
-        row_num = idx + 2  # Excel row number (1-indexed + header)
-        level = str(row.get("Input Level", "")).lower().strip()
-        
-        if level not in {"campaign", "adset"}:
-            errors.append({
-                "row": row_num, 
-                "field": "Input Level", 
-                "error": "Must be 'campaign' or 'adset'"
-            })
-            continue
+    # Forward-fill campaign-level values; columns missing from the input behave
+    # as if left blank. assign() only builds the new columns, the rest are shared
+    ffilled = {col: df[col].ffill() for col in CAMPAIGN_COLUMNS if col in df.columns}
+    missing = {col: "" for col in INPUT_COLUMNS if col not in df.columns}
+    df_ff = df.assign(**ffilled, **missing)
 
-        try:
-            if level == "campaign":
-                # Process campaign row - simpler structure
-                objective = _enum(
-                    row.get("Campaign Objective", ""), 
-                    VALID["objectives"], 
-                    "Campaign Objective"
-                )
-                
-                output_row = {
-                    "Campaign Name": str(row.get("Campaign Name", "")).strip(),
-                    "Campaign Status": _enum(
-                        row.get("Campaign Status", "ACTIVE"), 
-                        VALID["status"], 
-                        "Campaign Status", 
-                        "ACTIVE"
-                    ),
-                    "Special Ad Categories": str(row.get("Special Ad Categories", "")).strip(),
-                    "Special Ad Category Country": str(row.get("Special Ad Category Country", "")).strip(),
-                    "Campaign Objective": objective,
-                    "Buying Type": _enum(
-                        row.get("Buying Type", "AUCTION"), 
-                        VALID["buying_type"], 
-                        "Buying Type", 
-                        "AUCTION"
-                    ),
-                    "Campaign Bid Strategy": _enum(
-                        row.get("Campaign Bid Strategy", "Lowest cost"), 
-                        VALID["bid_strategies"], 
-                        "Campaign Bid Strategy", 
-                        "Lowest cost"
-                    ),
-                    "Campaign Daily Budget": _pos_number(row.get("Campaign Daily Budget", "")),
-                    "Campaign Start Time": _coerce_time(row.get("Campaign Start Time", "")),
-                    "Campaign Stop Time": _coerce_time(row.get("Campaign Stop Time", "")),
-                }
-                rows.append(output_row)
-                
-            else:  # adset level
-                # Process adset row - includes campaign, adset, and ad data
-                objective = _enum(
-                    row.get("Campaign Objective", ""), 
-                    VALID["objectives"], 
-                    "Campaign Objective"
-                )
-                
-                # Handle budget conflict resolution
-                campaign_budget = str(row.get("Campaign Daily Budget", "")).strip()
-                adset_budget = str(row.get("Ad Set Daily Budget", "")).strip()
-                
-                # If both are specified, prefer adset budget and clear campaign budget
-                if campaign_budget and adset_budget:
-                    campaign_budget = ""
-                
-                # Process age ranges
-                age_min, age_max = _age_pair(
-                    row.get("Age Min", ""), 
-                    row.get("Age Max", ""), 
-                    row.get("Special Ad Categories", "")
-                )
-                
-                # Process link and UTM parameters
-                link, utm_tags = _process_utm_parameters(
-                    row.get("Link", ""), 
-                    row.get("URL Tags", ""),
-                    str(row.get("Campaign Name", "")).strip(),
-                    str(row.get("Ad Set Name", "")).strip()
-                )
-                
-                # Get defaults based on objective
-                cta = _default_cta(objective, row.get("Call to Action", ""))
-                opt_goal = _default_opt_goal(objective, row.get("Optimisation Goal", ""))
-                
-                output_row = {
-                    # Campaign level (inherited)
-                    "Campaign Name": str(row.get("Campaign Name", "")).strip(),
-                    "Campaign Status": _enum(
-                        row.get("Campaign Status", "ACTIVE"), 
-                        VALID["status"], 
-                        "Campaign Status", 
-                        "ACTIVE"
-                    ),
-                    "Special Ad Categories": str(row.get("Special Ad Categories", "")).strip(),
-                    "Special Ad Category Country": str(row.get("Special Ad Category Country", "")).strip(),
-                    "Campaign Objective": objective,
-                    "Buying Type": _enum(
-                        row.get("Buying Type", "AUCTION"), 
-                        VALID["buying_type"], 
-                        "Buying Type", 
-                        "AUCTION"
-                    ),
-                    "Campaign Bid Strategy": _enum(
-                        row.get("Campaign Bid Strategy", "Lowest cost"), 
-                        VALID["bid_strategies"], 
-                        "Campaign Bid Strategy", 
-                        "Lowest cost"
-                    ),
-                    "Campaign Daily Budget": _pos_number(campaign_budget) if campaign_budget else "",
-                    "Campaign Start Time": _coerce_time(row.get("Campaign Start Time", "")),
-                    "Campaign Stop Time": _coerce_time(row.get("Campaign Stop Time", "")),
-                    
-                    # Ad Set level
-                    "Ad Set Name": str(row.get("Ad Set Name", "")).strip(),
-                    "Ad Set Run Status": _enum(
-                        row.get("Ad Set Run Status", "ACTIVE"), 
-                        VALID["status"], 
-                        "Ad Set Run Status", 
-                        "ACTIVE"
-                    ),
-                    "Ad Set Daily Budget": _pos_number(adset_budget) if adset_budget else "",
-                    "Ad Set Time Start": _coerce_time(row.get("Ad Set Time Start", "")),
-                    "Ad Set Time Stop": _coerce_time(row.get("Ad Set Time Stop", "")),
-                    "Countries": str(row.get("Countries", "")).strip(),
-                    "Age Min": age_min,
-                    "Age Max": age_max,
-                    "Gender": _gender(row.get("Gender", "All")),
-                    "Custom Audiences": str(row.get("Custom Audiences", "")).strip(),
-                    "Excluded Custom Audiences": str(row.get("Excluded Custom Audiences", "")).strip(),
-                    "Saved Audiences": str(row.get("Saved Audiences", "")).strip(),
-                    "Excluded Saved Audiences": str(row.get("Excluded Saved Audiences", "")).strip(),
-                    "Optimisation Goal": opt_goal,
-                    "Publisher Platforms": "facebook,instagram",  # Default to Facebook and Instagram only
-                    
-                    # Ad/Creative level
-                    "Ad Name": str(row.get("Ad Name", "")).strip(),
-                    "Ad Status": _enum(
-                        row.get("Ad Status", "ACTIVE"), 
-                        VALID["status"], 
-                        "Ad Status", 
-                        "ACTIVE"
-                    ),
-                    "Headline": str(row.get("Headline", "")).strip(),
-                    "Primary Text": str(row.get("Primary Text", "")).strip(),
-                    "Description": str(row.get("Description", "")).strip(),
-                    "Link": link,
-                    "URL Tags": utm_tags,
-                    "Call to Action": cta,
-                    "Image File Name": str(row.get("Image File Name", "")).strip(),
-                }
-                rows.append(output_row)
-                
-        except Exception as e:
-            errors.append({
-                "row": row_num,
-                "field": level,
-                "error": str(e)
-            })
+    # Blank-fill and strip text columns once; ages become numbers (NaN when blank)
+    df_ff[TEXT_COLUMNS] = df_ff[TEXT_COLUMNS].fillna("").apply(lambda s: s.astype(str).str.strip())
+    raw_ages = {}
+    for col in AGE_COLUMNS:
+        raw_ages[col] = df_ff[col].astype("string").str.strip().fillna("")
+        df_ff[col] = pd.to_numeric(raw_ages[col].where(raw_ages[col].ne("")), errors="coerce").astype("float64")
 
-    # Create output DataFrame
-    output_df = pd.DataFrame(rows)
+    row_nums = df_ff.index + 2  # Excel row numbers (1-indexed + header)
+    levels = df_ff["Input Level"].str.lower()
+    
+    # Every check below is a column-wide mask; failing rows are dropped from the output
+    invalid = np.zeros(len(df_ff), dtype=bool)
+    
+    def flag(bad: np.ndarray, check_levels: set, message) -> None:
+        bad = bad & levels.isin(check_levels).to_numpy(dtype=bool)
+        positions = np.flatnonzero(bad)
+        err_rows.extend(row_nums[positions])
+        err_fields.extend(levels.iloc[positions])
+        err_msgs.extend(message(pos) for pos in positions)
+        np.logical_or(invalid, bad, out=invalid)
     
-    # Define column order for Meta Ads Manager compatibility
-    column_order = [
-        # Campaign
-        "Campaign Name", "Campaign Status", "Special Ad Categories", 
-        "Special Ad Category Country", "Campaign Objective", "Buying Type", 
-        "Campaign Bid Strategy", "Campaign Daily Budget", "Campaign Start Time", 
-        "Campaign Stop Time",
+    positions = np.flatnonzero(~levels.isin({"campaign", "adset"}).to_numpy(dtype=bool))
+    err_rows.extend(row_nums[positions])
+    err_fields.extend(["Input Level"] * len(positions))
+    err_msgs.extend(["Must be 'campaign' or 'adset'"] * len(positions))
+    
+    # Validate enum columns
+    for col, allowed, default, check_levels in ENUM_COLUMNS:
+        raw = df_ff[col]
+        df_ff[col], bad = _enum(raw, allowed, default)
+        allowed_sorted = sorted(allowed)
+        flag(bad, check_levels, lambda pos: f"{col}: '{str(raw.iat[pos]).strip()}' not in {allowed_sorted}")
+    
+    # Normalise time columns
+    for col, check_levels in TIME_COLUMNS:
+        raw = df_ff[col]
+        df_ff[col], bad = _coerce_time(raw)
+        flag(bad, check_levels, lambda pos: f"Invalid time format: {raw.iat[pos]}. Use YYYY-MM-DD HH:MM or YYYY-MM-DD")
+    
+    # Ages: present but not whole-number sized (NaN, inf, beyond int64), or Min above Max
+    not_numeric = np.zeros(len(df_ff), dtype=bool)
+    for col, raw in raw_ages.items():
+        n = df_ff[col].to_numpy()
+        with np.errstate(invalid="ignore"):
+            unusable = ~(np.abs(n) < 2**63)  # NaN compares False, so it's caught too
+        not_numeric |= raw.ne("").to_numpy(dtype=bool) & unusable
+    df_ff["Age Min"], df_ff["Age Max"], bad = _age_pair(
+        df_ff["Age Min"], df_ff["Age Max"], df_ff["Special Ad Categories"]
+    )
+    bad = bad | not_numeric
+    age_min, age_max = raw_ages["Age Min"], raw_ages["Age Max"]
+    special = df_ff["Special Ad Categories"]
+    flag(bad, {"adset"}, lambda pos: (
+        f"Invalid age pair: Min={age_min.iat[pos] or 'nan'}, Max={age_max.iat[pos] or 'nan'}. "
+        f"Must be integers between {18 if special.iat[pos] else 13}-65"
+    ))
+    
+    # Convert budgets
+    df_ff["Ad Set Daily Budget"], bad = _pos_number(df_ff["Ad Set Daily Budget"])
+    values = df_ff["Ad Set Daily Budget"]
+    flag(bad, {"adset"}, lambda pos: f"Invalid positive number: {values.iat[pos]}")
+    campaign_budget, bad = _pos_number(df_ff["Campaign Daily Budget"])
+    
+    # If both are specified on an adset row, prefer adset budget and clear
+    # (and skip checking) the campaign budget
+    both = (
+        levels.eq("adset").to_numpy(dtype=bool)
+        & campaign_budget.ne("").to_numpy(dtype=bool)
+        & df_ff["Ad Set Daily Budget"].ne("").to_numpy(dtype=bool)
+    )
+    df_ff["Campaign Daily Budget"] = np.where(both, "", campaign_budget)
+    values = df_ff["Campaign Daily Budget"]
+    flag(bad & ~both, {"campaign", "adset"}, lambda pos: f"Invalid positive number: {values.iat[pos]}")
+    
+    raw = df_ff["Gender"]
+    df_ff["Gender"], bad = _gender(raw)
+    flag(bad, {"adset"}, lambda pos: f"Gender: '{raw.iat[pos]}' must be one of {sorted(_GENDER)}")
+    
+    df_ff["Link"], df_ff["URL Tags"], bad = _process_utm_parameters(
+        df_ff["Link"], df_ff["URL Tags"],
+        df_ff["Campaign Name"], df_ff["Ad Set Name"]
+    )
+    values = df_ff["URL Tags"]
+    flag(bad, {"adset"}, lambda pos: (
+        f"Invalid UTM format: '{values.iat[pos]}'. "
+        f"Expected format: utm_source=meta&utm_medium=cpc&utm_campaign={{{{campaign.name}}}}"
+    ))
+    
+    # Split into campaign and adset batches
+    campaign_mask = levels.eq("campaign").to_numpy(dtype=bool) & ~invalid
+    adset_mask = levels.eq("adset").to_numpy(dtype=bool) & ~invalid
+    df_c = df_ff[campaign_mask]
+    df_a = df_ff[adset_mask]
+    
+    # Campaign rows leave the adset and creative columns blank
+    df_out_c = pd.DataFrame(_campaign_output(df_c), index=df_c.index)
+    
+    df_out_a = pd.DataFrame({
+        **_campaign_output(df_a),
         
-        # Ad Set
-        "Ad Set Name", "Ad Set Run Status", "Ad Set Daily Budget", 
-        "Ad Set Time Start", "Ad Set Time Stop", "Countries", "Age Min", "Age Max", 
-        "Gender", "Custom Audiences", "Excluded Custom Audiences", 
-        "Saved Audiences", "Excluded Saved Audiences", "Optimisation Goal", 
-        "Publisher Platforms",
+        # Ad Set level
+        "Ad Set Name": df_a["Ad Set Name"],
+        "Ad Set Run Status": df_a["Ad Set Run Status"],
+        "Ad Set Daily Budget": df_a["Ad Set Daily Budget"],
+        "Ad Set Time Start": df_a["Ad Set Time Start"],
+        "Ad Set Time Stop": df_a["Ad Set Time Stop"],
+        "Countries": df_a["Countries"],
+        "Age Min": df_a["Age Min"],
+        "Age Max": df_a["Age Max"],
+        "Gender": df_a["Gender"],
+        "Custom Audiences": df_a["Custom Audiences"],
+        "Excluded Custom Audiences": df_a["Excluded Custom Audiences"],
+        "Saved Audiences": df_a["Saved Audiences"],
+        "Excluded Saved Audiences": df_a["Excluded Saved Audiences"],
+        "Optimisation Goal": _default_opt_goal(df_a["Campaign Objective"], df_a["Optimisation Goal"]),
+        "Publisher Platforms": "facebook,instagram",  # Default to Facebook and Instagram only
         
-        # Ad/Creative
-        "Ad Name", "Ad Status", "Headline", "Primary Text", "Description", 
-        "Link", "URL Tags", "Call to Action", "Image File Name"
-    ]
-    
-    # Ensure all columns exist and reorder
-    for col in column_order:
-        if col not in output_df.columns:
-            output_df[col] = ""
+        # Ad/Creative level
+        "Ad Name": df_a["Ad Name"],
+        "Ad Status": df_a["Ad Status"],
+        "Headline": df_a["Headline"],
+        "Primary Text": df_a["Primary Text"],
+        "Description": df_a["Description"],
+        "Link": df_a["Link"],
+        "URL Tags": df_a["URL Tags"],
+        "Call to Action": _default_cta(df_a["Campaign Objective"], df_a["Call to Action"]),
+        "Image File Name": df_a["Image File Name"],
+    }, index=df_a.index)
     
-    output_df = output_df[column_order]
+    # Recombine in input order
+    output_df = (
+        pd.concat([df_out_c, df_out_a])
+        .sort_index(kind="stable")
+        .reindex(columns=OUTPUT_COLUMNS)
+        .astype(object)
+        .fillna("")
+        .astype(str)
+        .reset_index(drop=True)
+    )
     
-    # Create errors DataFrame
-    errors_df = pd.DataFrame(errors)
+    # Create errors DataFrame (bulk checks and row checks, in row order)
+    errors_df = pd.DataFrame({"row": err_rows, "field": err_fields, "error": err_msgs})
+    errors_df = errors_df.sort_values("row", kind="stable", ignore_index=True)
     
     return output_df, errors_df
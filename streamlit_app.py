@@ -1,8 +1,219 @@
+import hashlib
 import streamlit as st
 import pandas as pd
-from io import StringIO
+from io import BytesIO
 from datetime import datetime, timedelta
-from fb_mapper import transform, VALID, OBJ_DEFAULTS
+from fb_mapper import transform, VALID, OBJ_CTA, UTM_DEFAULT
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # pandas' parser is the fallback
+    pa = None
+
+# Copy-on-write makes fillna/assign share untouched columns; it's always on from pandas 3
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.options.mode.copy_on_write = True
+
+# Uploads above this size are parsed in chunks to keep peak memory down
+LARGE_CSV_BYTES = 25 * 1024 * 1024
+CSV_CHUNK_SIZE = 50_000
+
+# On-page tables stop here; downloads always carry every row
+PREVIEW_ROWS = 500
+
+# st.cache_data is process-wide (every session shares it), so each cache keeps
+# only recent entries and drops anything untouched for an hour
+CACHE_ENTRIES = 16
+CACHE_TTL = 60 * 60
+
+# Selectbox options in a fixed order (VALID holds sets) with value → position lookups
+_OBJ_OPTIONS = tuple(sorted(VALID["objectives"]))
+_BID_OPTIONS = tuple(sorted(VALID["bid_strategies"]))
+_STATUS_OPTIONS = tuple(sorted(VALID["status"]))
+_GENDER_OPTIONS = tuple(sorted(VALID["gender"]))
+_INDEX = {
+    name: {v: i for i, v in enumerate(opts)}
+    for name, opts in (
+        ("objectives", _OBJ_OPTIONS),
+        ("bid_strategies", _BID_OPTIONS),
+        ("status", _STATUS_OPTIONS),
+        ("gender", _GENDER_OPTIONS),
+    )
+}
+_SPECIAL_OPTIONS = ("",) + tuple(sorted(VALID["special_categories"]))
+
+
+def _hash_frame(df: pd.DataFrame) -> bytes:
+    """Hash every row (and the index) rather than Streamlit's sample of large frames."""
+    # Row hashes ignore column names, so fold the header in too
+    header = "\x1f".join(map(str, df.columns)).encode()
+    return header + pd.util.hash_pandas_object(df, index=True).values.tobytes()
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, hash_funcs={pd.DataFrame: _hash_frame})
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """Encode a DataFrame as UTF-8 CSV with a BOM (so Excel opens it cleanly).
+
+    Cached, so unchanged downloads aren't re-serialised on every rerun. Written
+    by pandas rather than pyarrow: Arrow quotes the header and every string
+    cell, which would change the Meta import file byte for byte.
+    """
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL)
+def read_csv_input(data: bytes) -> pd.DataFrame:
+    """Parse an uploaded or pasted CSV, preferring pyarrow's multithreaded parser.
+
+    Every column is read as str, like the chunked path: transform() validates
+    the types itself, and Arrow's inference would shift offset timestamps to
+    UTC. Cached on the raw bytes, so reruns from unrelated widgets skip the parse.
+    """
+    if pa is not None:
+        # pandas names the columns (so 'Unnamed: N' and the duplicate suffixes match
+        # it exactly); non-UTF-8 headers fail here and surface as a read error
+        names = pd.read_csv(BytesIO(data), nrows=0).columns.tolist()
+        # Arrow's skip_rows counts physical lines, so leave leading blank lines and
+        # multi-line header cells to pandas
+        first_line = data.removeprefix(b"\xef\xbb\xbf").split(b"\n", 1)[0]
+        if first_line.strip() and not any("\n" in name for name in names):
+            try:
+                table = pa_csv.read_csv(
+                    pa.BufferReader(data),
+                    read_options=pa_csv.ReadOptions(
+                        use_threads=True, block_size=1 << 20, column_names=names, skip_rows=1,
+                    ),
+                    # Blank cells as nulls, like pandas, so the sidebar defaults fill them
+                    convert_options=pa_csv.ConvertOptions(
+                        column_types={name: pa.string() for name in names},
+                        strings_can_be_null=True,
+                    ),
+                )
+                # NumPy-backed dtypes on purpose: all-blank columns would otherwise
+                # come back as null[pyarrow], which rejects the fillna defaults
+                return table.to_pandas()
+            except pa.ArrowInvalid:
+                # Arrow is strict about ragged rows (and invalid UTF-8); pandas pads
+                # the former and raises on the latter
+                pass
+    return pd.read_csv(BytesIO(data), dtype=str)
+
+
+def read_csv_chunked(source) -> pd.DataFrame:
+    """Parse a large upload CSV_CHUNK_SIZE rows at a time.
+
+    Everything is read as str: transform() validates the types itself, so
+    per-chunk inference would only be wasted work.
+    """
+    reader = pd.read_csv(source, chunksize=CSV_CHUNK_SIZE, dtype=str)
+    return pd.concat(reader, ignore_index=True)
+
+
+def session_frame(source: str, data: bytes, parse) -> pd.DataFrame:
+    """Keep this user's parsed input in session_state, calling parse() only when it changes.
+
+    One slot per session: switching between upload and paste replaces the frame.
+    """
+    digest = hashlib.blake2b(data, digest_size=8, person=source.encode()).hexdigest()
+    if st.session_state.get("_input_hash") != digest:
+        # Let the old frame go before parsing the new one
+        st.session_state.pop("input_df", None)
+        st.session_state.pop("_input_hash", None)
+        st.session_state["input_df"] = parse()
+        st.session_state["_input_hash"] = digest
+    return st.session_state["input_df"]
+
+
+def show_preview(df: pd.DataFrame) -> None:
+    """Render at most PREVIEW_ROWS rows, noting when the table was cut short."""
+    st.dataframe(df.head(PREVIEW_ROWS), use_container_width=True)
+    if len(df) > PREVIEW_ROWS:
+        st.caption(f"Showing first {PREVIEW_ROWS} of {len(df)} rows — full file available in download")
+
+
+# Download clicks rerun only this fragment, not the whole page (st.fragment needs Streamlit 1.37+)
+_fragment = getattr(st, "fragment", lambda func: func)
+
+
+@_fragment
+def download_section(output_df: pd.DataFrame, errors_df: pd.DataFrame) -> None:
+    """The three download buttons; each payload comes from the CSV cache."""
+    st.subheader("💾 Download Options")
+
+    col_dl1, col_dl2, col_dl3 = st.columns(3)
+
+    with col_dl1:
+        # Main download
+        csv_output = to_csv_bytes(output_df)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+        filename = f"meta_ads_upload_{timestamp}.csv"
+
+        st.download_button(
+            label="📁 Download Meta Ads CSV",
+            data=csv_output,
+            file_name=filename,
+            mime="text/csv",
+            type="primary"
+        )
+
+    with col_dl2:
+        # Debug download
+        if not errors_df.empty:
+            errors_csv = to_csv_bytes(errors_df)
+            st.download_button(
+                label="🐛 Download Errors Report",
+                data=errors_csv,
+                file_name=f"validation_errors_{timestamp}.csv",
+                mime="text/csv"
+            )
+
+    with col_dl3:
+        # Template download
+        st.download_button(
+            label="📋 Download Template",
+            data=template_csv(),
+            file_name="meta_ads_template.csv",
+            mime="text/csv",
+            help="Download a sample template to get started"
+        )
+
+
+@st.cache_data(show_spinner=False, max_entries=CACHE_ENTRIES, ttl=CACHE_TTL, hash_funcs={pd.DataFrame: _hash_frame})
+def cached_transform(df: pd.DataFrame):
+    """transform() memoised on the frame's contents, so reruns with unchanged input are free."""
+    return transform(df)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def template_csv() -> bytes:
+    """The sample upload offered from the results page.
+
+    Streamlit re-executes this script on every rerun, so the constant lives
+    behind the cache rather than at top level.
+    """
+    return to_csv_bytes(pd.DataFrame({
+        'Input Level': ['campaign', 'adset', 'adset'],
+        'Campaign Name': ['Example Campaign', 'Example Campaign', 'Example Campaign'],
+        'Campaign Status': ['ACTIVE', '', ''],
+        'Campaign Objective': ['Conversions', '', ''],
+        'Campaign Daily Budget': ['100', '', ''],
+        'Ad Set Name': ['', 'Prospecting', 'Remarketing'],
+        'Ad Set Daily Budget': ['', '50', '30'],
+        'Countries': ['', 'GB', 'GB'],
+        'Age Min': ['', '25', '25'],
+        'Age Max': ['', '55', '55'],
+        'Custom Audiences': ['', '', 'ca_website_visitors'],
+        'Saved Audiences': ['', 'interested_in_cars', ''],
+        'Ad Name': ['', 'Prospecting Ad', 'Remarketing Ad'],
+        'Headline': ['', 'Great Product!', 'Come Back!'],
+        'Primary Text': ['', 'Amazing offer for you', 'Complete your purchase'],
+        'Description': ['', 'Limited time only', 'Don\'t miss out'],
+        'Link': ['', 'https://example.com', 'https://example.com'],
+        'URL Tags': ['', UTM_DEFAULT, UTM_DEFAULT],
+        'Call to Action': ['', 'SHOP_NOW', 'SHOP_NOW']
+    }))
+
 
 # Page configuration
 st.set_page_config(
@@ -69,8 +280,8 @@ with st.sidebar:
     st.subheader("Campaign Defaults")
     default_objective = st.selectbox(
         "Default Objective",
-        options=list(VALID["objectives"]),
-        index=list(VALID["objectives"]).index("Conversions")
+        options=_OBJ_OPTIONS,
+        index=_INDEX["objectives"].get("Conversions", 0)
     )
     
     default_budget = st.number_input(
@@ -82,21 +293,21 @@ with st.sidebar:
     
     default_bid_strategy = st.selectbox(
         "Default Bid Strategy",
-        options=list(VALID["bid_strategies"]),
-        index=0
+        options=_BID_OPTIONS,
+        index=_INDEX["bid_strategies"].get("Lowest cost", 0)
     )
     
     # Special ad categories
     st.subheader("Compliance")
     special_ad_category = st.selectbox(
         "Special Ad Category",
-        options=[""] + list(VALID["special_categories"]),
+        options=_SPECIAL_OPTIONS,
         help="Required for credit, employment, housing, social issues, or political ads"
     )
     
-    if special_ad_category:
-        special_ad_country = st.text_input("Special Ad Country", value="GB")
-    else:
+    # Always rendered (disabled without a category) so the widget isn't rebuilt on each toggle
+    special_ad_country = st.text_input("Special Ad Country", value="GB", disabled=not special_ad_category)
+    if not special_ad_category:
         special_ad_country = ""
     
     # Default audience
@@ -104,7 +315,7 @@ with st.sidebar:
     default_country = st.text_input("Default Country", value="GB")
     default_age_min = st.number_input("Min Age", min_value=13, max_value=65, value=18)
     default_age_max = st.number_input("Max Age", min_value=13, max_value=65, value=65)
-    default_gender = st.selectbox("Gender", options=list(VALID["gender"]), index=0)
+    default_gender = st.selectbox("Gender", options=_GENDER_OPTIONS, index=_INDEX["gender"].get("All", 0))
     
     # UTM defaults
     st.subheader("UTM Defaults")
@@ -115,7 +326,8 @@ with st.sidebar:
     utm_content = st.text_input("UTM Content", value="{{adset.name}}", 
                                help="Meta dynamic parameter for ad set name")
     
-    st.caption("Full UTM string: utm_source=meta&utm_medium=cpc&utm_campaign={{campaign.name}}&utm_content={{adset.name}}")
+    utm_params = f"utm_source={utm_source}&utm_medium={utm_medium}&utm_campaign={utm_campaign}&utm_content={utm_content}"
+    st.caption(f"Full UTM string: {utm_params}")
 
 # Main content area
 col1, col2 = st.columns([2, 1])
@@ -125,24 +337,21 @@ with col2:
     if 'processed_data' in st.session_state:
         stats = st.session_state.processed_data
         
+        # One markdown element for all three cards, stacked as before
         st.markdown(f"""
-        <div class="metric-container">
-            <h3>{stats.get('campaigns', 0)}</h3>
-            <p>Campaigns</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown(f"""
-        <div class="metric-container">
-            <h3>{stats.get('adsets', 0)}</h3>
-            <p>Ad Sets</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown(f"""
-        <div class="metric-container">
-            <h3>£{stats.get('total_budget', 0):,.0f}</h3>
-            <p>Total Daily Budget</p>
+        <div style="display:flex;flex-direction:column;gap:1rem">
+            <div class="metric-container">
+                <h3>{stats.get('campaigns', 0)}</h3>
+                <p>Campaigns</p>
+            </div>
+            <div class="metric-container">
+                <h3>{stats.get('adsets', 0)}</h3>
+                <p>Ad Sets</p>
+            </div>
+            <div class="metric-container">
+                <h3>£{stats.get('total_budget', 0):,.0f}</h3>
+                <p>Total Daily Budget</p>
+            </div>
         </div>
         """, unsafe_allow_html=True)
 
@@ -166,7 +375,11 @@ with col1:
         )
         if uploaded_file is not None:
             try:
-                df_input = pd.read_csv(uploaded_file)
+                data = uploaded_file.getvalue()
+                if uploaded_file.size > LARGE_CSV_BYTES:
+                    df_input = session_frame("upload", data, lambda: read_csv_chunked(uploaded_file))
+                else:
+                    df_input = session_frame("upload", data, lambda: read_csv_input(data))
                 st.success(f"✅ File uploaded successfully! {len(df_input)} rows found.")
             except Exception as e:
                 st.error(f"❌ Error reading file: {e}")
@@ -180,7 +393,8 @@ with col1:
         )
         if pasted_data.strip():
             try:
-                df_input = pd.read_csv(StringIO(pasted_data))
+                data = pasted_data.encode('utf-8')
+                df_input = session_frame("paste", data, lambda: read_csv_input(data))
                 st.success(f"✅ Data parsed successfully! {len(df_input)} rows found.")
             except Exception as e:
                 st.error(f"❌ Error parsing data: {e}")
@@ -192,74 +406,72 @@ with col1:
             col_a, col_b = st.columns(2)
             with col_a:
                 camp_name = st.text_input("Campaign Name", value="My Campaign")
-                camp_obj = st.selectbox("Objective", options=list(VALID["objectives"]), 
-                                       index=list(VALID["objectives"]).index(default_objective))
+                camp_obj = st.selectbox("Objective", options=_OBJ_OPTIONS, 
+                                       index=_INDEX["objectives"].get(default_objective, 0))
             with col_b:
                 camp_budget = st.number_input("Daily Budget (£)", min_value=1, value=default_budget)
-                camp_status = st.selectbox("Status", options=list(VALID["status"]), index=0)
+                camp_status = st.selectbox("Status", options=_STATUS_OPTIONS, index=_INDEX["status"].get("ACTIVE", 0))
         
         # Ad Sets builder
         st.subheader("Ad Sets")
         num_adsets = st.number_input("Number of Ad Sets", min_value=1, max_value=10, value=2)
         
-        adset_data = []
-        for i in range(num_adsets):
-            with st.expander(f"Ad Set {i+1}", expanded=i==0):
-                col_c, col_d = st.columns(2)
-                with col_c:
-                    as_name = st.text_input(f"Ad Set Name", value=f"{camp_name} - AdSet {i+1}", key=f"as_name_{i}")
-                    as_budget = st.number_input(f"Daily Budget (£)", min_value=1, value=25, key=f"as_budget_{i}")
-                    audience = st.text_input(f"Custom Audiences", placeholder="ca_lookalike_1pct", key=f"audience_{i}")
-                with col_d:
-                    ad_headline = st.text_input(f"Ad Headline", value=f"Great offer {i+1}", key=f"ad_headline_{i}")
-                    ad_primary_text = st.text_area(f"Primary Text", value="Discover amazing products", height=60, key=f"ad_primary_{i}")
-                    ad_description = st.text_input(f"Description", value="Limited time offer", key=f"ad_desc_{i}")
-                    landing_url = st.text_input(f"Landing Page URL", value="https://example.com", key=f"url_{i}")
-                
-                adset_data.append({
-                    'name': as_name, 'budget': as_budget, 'audience': audience,
-                    'headline': ad_headline, 'primary_text': ad_primary_text, 
-                    'description': ad_description, 'url': landing_url
-                })
+        # One editable table instead of seven widgets per ad set; rows can be added or pasted in
+        adset_data = st.data_editor(
+            pd.DataFrame({
+                'name': [f"{camp_name} - AdSet {i+1}" for i in range(num_adsets)],
+                'budget': [25] * num_adsets,
+                'audience': [''] * num_adsets,
+                'headline': [f"Great offer {i+1}" for i in range(num_adsets)],
+                'primary_text': ["Discover amazing products"] * num_adsets,
+                'description': ["Limited time offer"] * num_adsets,
+                'url': ["https://example.com"] * num_adsets,
+            }),
+            num_rows="dynamic",
+            use_container_width=True,
+            hide_index=True,
+            key="adsets",
+            column_config={
+                'name': st.column_config.TextColumn("Ad Set Name", required=True),
+                'budget': st.column_config.NumberColumn("Daily Budget (£)", min_value=1, default=25),
+                'audience': st.column_config.TextColumn("Custom Audiences", help="e.g. ca_lookalike_1pct"),
+                'headline': st.column_config.TextColumn("Ad Headline"),
+                'primary_text': st.column_config.TextColumn("Primary Text"),
+                'description': st.column_config.TextColumn("Description"),
+                'url': st.column_config.LinkColumn("Landing Page URL"),
+            },
+        )
         
         if st.button("🚀 Generate Campaign Data", type="primary"):
-            # Create DataFrame from builder
-            rows = []
-            # Campaign row
-            rows.append({
-                'Input Level': 'campaign',
-                'Campaign Name': camp_name,
-                'Campaign Status': camp_status,
-                'Campaign Objective': camp_obj,
-                'Campaign Daily Budget': camp_budget,
-                'Special Ad Categories': special_ad_category,
-                'Special Ad Category Country': special_ad_country,
-            })
-            
-            # Ad set rows
-            for i, adset in enumerate(adset_data):
-                utm_params = f"utm_source={utm_source}&utm_medium={utm_medium}&utm_campaign={utm_campaign}&utm_content={utm_content}"
-                
-                rows.append({
-                    'Input Level': 'adset',
-                    'Campaign Name': camp_name,
-                    'Ad Set Name': adset['name'],
-                    'Ad Set Daily Budget': adset['budget'],
-                    'Countries': default_country,
-                    'Age Min': default_age_min,
-                    'Age Max': default_age_max,
-                    'Gender': default_gender,
-                    'Custom Audiences': adset['audience'],
-                    'Ad Name': f"{adset['name']} - Ad",
-                    'Headline': adset['headline'],
-                    'Primary Text': adset['primary_text'],
-                    'Description': adset['description'],
-                    'Link': adset['url'],
-                    'URL Tags': utm_params,
-                    'Call to Action': OBJ_DEFAULTS.get(camp_obj, {}).get('cta', 'LEARN_MORE')
-                })
+            # Create DataFrame from builder: one campaign row, then the ad sets.
+            # None (not '') on the other level's cells so the sidebar defaults still see them as empty
+            n = len(adset_data)
+            blank = [None] * n
+            cta = OBJ_CTA.get(camp_obj, 'LEARN_MORE')
             
-            df_input = pd.DataFrame(rows)
+            df_input = pd.DataFrame({
+                'Input Level': ['campaign'] + ['adset'] * n,
+                'Campaign Name': [camp_name] * (n + 1),
+                'Campaign Status': [camp_status] + blank,
+                'Campaign Objective': [camp_obj] + blank,
+                'Campaign Daily Budget': [camp_budget] + blank,
+                'Special Ad Categories': [special_ad_category] + blank,
+                'Special Ad Category Country': [special_ad_country] + blank,
+                'Ad Set Name': [None] + adset_data['name'].tolist(),
+                'Ad Set Daily Budget': [None] + adset_data['budget'].tolist(),
+                'Countries': [None] + [default_country] * n,
+                'Age Min': [None] + [default_age_min] * n,
+                'Age Max': [None] + [default_age_max] * n,
+                'Gender': [None] + [default_gender] * n,
+                'Custom Audiences': [None] + adset_data['audience'].tolist(),
+                'Ad Name': [None] + (adset_data['name'] + " - Ad").tolist(),
+                'Headline': [None] + adset_data['headline'].tolist(),
+                'Primary Text': [None] + adset_data['primary_text'].tolist(),
+                'Description': [None] + adset_data['description'].tolist(),
+                'Link': [None] + adset_data['url'].tolist(),
+                'URL Tags': [None] + [utm_params] * n,
+                'Call to Action': [None] + [cta] * n,
+            })
             st.success("✅ Campaign data generated!")
 
 # Processing section
@@ -269,48 +481,39 @@ if df_input is not None:
     
     # Show input preview
     with st.expander("👀 Input Data Preview", expanded=False):
-        st.dataframe(df_input, use_container_width=True)
+        show_preview(df_input)
     
     # Apply defaults to missing fields
     if st.checkbox("🔧 Apply sidebar defaults to empty fields", value=True):
-        df_enhanced = df_input.copy()
-        
-        # Apply defaults where fields are empty
-        if 'Campaign Objective' in df_enhanced.columns:
-            df_enhanced['Campaign Objective'] = df_enhanced['Campaign Objective'].fillna(default_objective)
-        if 'Campaign Daily Budget' in df_enhanced.columns:
-            df_enhanced['Campaign Daily Budget'] = df_enhanced['Campaign Daily Budget'].fillna(default_budget)
-        if 'Campaign Bid Strategy' in df_enhanced.columns:
-            df_enhanced['Campaign Bid Strategy'] = df_enhanced['Campaign Bid Strategy'].fillna(default_bid_strategy)
-        if 'Countries' in df_enhanced.columns:
-            df_enhanced['Countries'] = df_enhanced['Countries'].fillna(default_country)
-        if 'Age Min' in df_enhanced.columns:
-            df_enhanced['Age Min'] = df_enhanced['Age Min'].fillna(default_age_min)
-        if 'Age Max' in df_enhanced.columns:
-            df_enhanced['Age Max'] = df_enhanced['Age Max'].fillna(default_age_max)
-        if 'Gender' in df_enhanced.columns:
-            df_enhanced['Gender'] = df_enhanced['Gender'].fillna(default_gender)
-        if 'Special Ad Categories' in df_enhanced.columns:
-            df_enhanced['Special Ad Categories'] = df_enhanced['Special Ad Categories'].fillna(special_ad_category)
-        if 'Special Ad Category Country' in df_enhanced.columns:
-            df_enhanced['Special Ad Category Country'] = df_enhanced['Special Ad Category Country'].fillna(special_ad_country)
-        
-        df_input = df_enhanced
+        defaults = {
+            'Campaign Objective': default_objective,
+            'Campaign Daily Budget': default_budget,
+            'Campaign Bid Strategy': default_bid_strategy,
+            'Countries': default_country,
+            'Age Min': default_age_min,
+            'Age Max': default_age_max,
+            'Gender': default_gender,
+            'Special Ad Categories': special_ad_category,
+            'Special Ad Category Country': special_ad_country,
+        }
+        # One fillna over the present columns; under copy-on-write the rest are shared, not copied
+        present = {k: v for k, v in defaults.items() if k in df_input.columns}
+        if present:
+            df_input = df_input.fillna(present)
     
     # Process the data
     try:
         with st.spinner("🔄 Processing your data..."):
-            output_df, errors_df = transform(df_input)
+            output_df, errors_df = cached_transform(df_input)
         
         # Calculate stats
-        campaigns = len(output_df[output_df['Campaign Name'] != '']['Campaign Name'].unique()) if not output_df.empty else 0
-        adsets = len(output_df[output_df['Ad Set Name'] != '']) if not output_df.empty else 0
-        total_budget = 0
-        
-        if not output_df.empty:
-            campaign_budgets = pd.to_numeric(output_df['Campaign Daily Budget'].replace('', 0), errors='coerce').sum()
-            adset_budgets = pd.to_numeric(output_df['Ad Set Daily Budget'].replace('', 0), errors='coerce').sum()
-            total_budget = max(campaign_budgets, adset_budgets)  # Avoid double counting
+        # transform() always returns every output column as str, so no .empty guards
+        campaigns = output_df.loc[output_df['Campaign Name'].ne(''), 'Campaign Name'].nunique()
+        adsets = int(output_df['Ad Set Name'].ne('').sum())
+        # errors='coerce' turns the '' cells into NaN, which sum() skips
+        campaign_budgets = pd.to_numeric(output_df['Campaign Daily Budget'], errors='coerce').sum()
+        adset_budgets = pd.to_numeric(output_df['Ad Set Daily Budget'], errors='coerce').sum()
+        total_budget = max(campaign_budgets, adset_budgets)  # Avoid double counting
         
         st.session_state.processed_data = {
             'campaigns': campaigns,
@@ -326,7 +529,7 @@ if df_input is not None:
                 <p>Please fix the following issues before exporting:</p>
             </div>
             """, unsafe_allow_html=True)
-            st.dataframe(errors_df, use_container_width=True)
+            show_preview(errors_df)
         else:
             st.markdown("""
             <div class="success-box">
@@ -349,71 +552,10 @@ if df_input is not None:
                 st.metric("Total Budget", f"£{total_budget:,.0f}/day")
             
             # Output preview
-            st.dataframe(output_df, use_container_width=True)
+            show_preview(output_df)
             
             # Download section
-            st.subheader("💾 Download Options")
-            
-            col_dl1, col_dl2, col_dl3 = st.columns(3)
-            
-            with col_dl1:
-                # Main download
-                csv_output = output_df.to_csv(index=False).encode('utf-8-sig')
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-                filename = f"meta_ads_upload_{timestamp}.csv"
-                
-                st.download_button(
-                    label="📁 Download Meta Ads CSV",
-                    data=csv_output,
-                    file_name=filename,
-                    mime="text/csv",
-                    type="primary"
-                )
-            
-            with col_dl2:
-                # Debug download
-                if not errors_df.empty:
-                    errors_csv = errors_df.to_csv(index=False).encode('utf-8-sig')
-                    st.download_button(
-                        label="🐛 Download Errors Report",
-                        data=errors_csv,
-                        file_name=f"validation_errors_{timestamp}.csv",
-                        mime="text/csv"
-                    )
-            
-            with col_dl3:
-                # Template download
-                template_data = {
-                    'Input Level': ['campaign', 'adset', 'adset'],
-                    'Campaign Name': ['Example Campaign', 'Example Campaign', 'Example Campaign'],
-                    'Campaign Status': ['ACTIVE', '', ''],
-                    'Campaign Objective': ['Conversions', '', ''],
-                    'Campaign Daily Budget': [100, '', ''],
-                    'Ad Set Name': ['', 'Prospecting', 'Remarketing'],
-                    'Ad Set Daily Budget': ['', 50, 30],
-                    'Countries': ['', 'GB', 'GB'],
-                    'Age Min': ['', 25, 25],
-                    'Age Max': ['', 55, 55],
-                    'Custom Audiences': ['', '', 'ca_website_visitors'],
-                    'Saved Audiences': ['', 'interested_in_cars', ''],
-                    'Ad Name': ['', 'Prospecting Ad', 'Remarketing Ad'],
-                    'Headline': ['', 'Great Product!', 'Come Back!'],
-                    'Primary Text': ['', 'Amazing offer for you', 'Complete your purchase'],
-                    'Description': ['', 'Limited time only', 'Don\'t miss out'],
-                    'Link': ['', 'https://example.com', 'https://example.com'],
-                    'URL Tags': ['', 'utm_source=meta&utm_medium=cpc&utm_campaign={{campaign.name}}&utm_content={{adset.name}}', 'utm_source=meta&utm_medium=cpc&utm_campaign={{campaign.name}}&utm_content={{adset.name}}'],
-                    'Call to Action': ['', 'SHOP_NOW', 'SHOP_NOW']
-                }
-                template_df = pd.DataFrame(template_data)
-                template_csv = template_df.to_csv(index=False).encode('utf-8-sig')
-                
-                st.download_button(
-                    label="📋 Download Template",
-                    data=template_csv,
-                    file_name="meta_ads_template.csv",
-                    mime="text/csv",
-                    help="Download a sample template to get started"
-                )
+            download_section(output_df, errors_df)
         
     except Exception as e:
         st.error(f"❌ Processing failed: {e}")
@@ -0,0 +1,202 @@
+import unittest
+
+import pandas as pd
+
+from fb_mapper import _coerce_time, _pos_number, transform
+
+
+class CoerceTimeTest(unittest.TestCase):
+    def test_mixed_offsets_keep_wall_clock(self):
+        # Offsets either side of a DST change, plus naive and Z values, in one column
+        col = pd.Series([
+            "2025-09-17T10:15:00+01:00",
+            "2025-11-01T10:15:00+00:00",
+            "2025-09-17T10:15:00Z",
+            "2025-09-17 10:15",
+            "not a date",
+        ])
+        values, bad = _coerce_time(col)
+        self.assertEqual(
+            values.tolist(),
+            ["2025-09-17 10:15", "2025-11-01 10:15", "2025-09-17 10:15", "2025-09-17 10:15", ""],
+        )
+        self.assertEqual(bad.tolist(), [False, False, False, False, True])
+
+    def test_zone_names_keep_wall_clock(self):
+        for given, expected in [
+            ("Wed, 01 Jan 2025 10:00:00 GMT", "2025-01-01 10:00"),
+            ("Jan 5 2025 10:00 GMT", "2025-01-05 10:00"),
+            ("01/02/2025 10:00 GMT+1", "2025-01-02 10:00"),
+        ]:
+            with self.subTest(given=given):
+                values, bad = _coerce_time(pd.Series([given]))
+                self.assertEqual(values.tolist(), [expected])
+                self.assertFalse(bad.any())
+
+    def test_zone_names_mixed_in_one_column(self):
+        col = pd.Series(["01/02/2025 10:00 GMT+1", "Jan 5 2025 10:00 GMT", "2025-01-01", "junk"])
+        values, bad = _coerce_time(col)
+        self.assertEqual(values.tolist(), ["2025-01-02 10:00", "2025-01-05 10:00", "2025-01-01 00:00", ""])
+        self.assertEqual(bad.tolist(), [False, False, False, True])
+
+
+class PosNumberTest(unittest.TestCase):
+    def test_budgets_round_to_whole_numbers(self):
+        values, bad = _pos_number(pd.Series(["50", "12.5", "13.5", "", "abc", "-3", "inf"]))
+        self.assertEqual(values.tolist(), ["50", "12", "14", "", "abc", "-3", "inf"])
+        self.assertEqual(bad.tolist(), [False, False, False, False, True, True, True])
+
+    def test_budgets_beyond_int64(self):
+        for col in (["1e20"], ["1e20", "50"]):
+            with self.subTest(col=col):
+                values, bad = _pos_number(pd.Series(col))
+                self.assertEqual(values.tolist()[0], "100000000000000000000")
+                self.assertFalse(bad.any())
+
+
+class AgePairTest(unittest.TestCase):
+    def test_non_finite_ages_are_rejected(self):
+        df = pd.DataFrame({
+            "Input Level": ["adset"] * 4,
+            "Campaign Name": ["My Camp"] * 4,
+            "Ad Set Name": ["inf", "1e30", "-inf", "ok"],
+            "Age Min": ["inf", "1e30", "-inf", "20"],
+            "Age Max": ["65", "65", "40", "inf"],
+        })
+        output_df, errors_df = transform(df)
+        self.assertEqual(output_df["Ad Set Name"].tolist(), [])
+        self.assertEqual(errors_df["row"].tolist(), [2, 3, 4, 5])
+        self.assertTrue(errors_df["error"].str.startswith("Invalid age pair").all())
+
+
+class CopyOnWriteTest(unittest.TestCase):
+    def test_campaign_only_input(self):
+        # No ad set rows leaves empty categoricals in the ad set helpers; streamlit_app
+        # turns copy-on-write on for pandas < 3 (it's always on from pandas 3)
+        df = pd.DataFrame({
+            "Input Level": ["campaign"],
+            "Campaign Name": ["My Camp"],
+            "Campaign Objective": ["Sales"],
+        })
+        if int(pd.__version__.split(".")[0]) < 3:
+            with pd.option_context("mode.copy_on_write", True):
+                output_df, errors_df = transform(df)
+        else:
+            output_df, errors_df = transform(df)
+        self.assertTrue(errors_df.empty)
+        self.assertEqual(output_df["Campaign Name"].tolist(), ["My Camp"])
+
+
+class ProcessUtmParametersTest(unittest.TestCase):
+    def test_placeholders_on_every_row(self):
+        # The placeholder mask covering every row used to break the assignment on pandas 3
+        df = pd.DataFrame({
+            "Input Level": ["adset", "adset"],
+            "Campaign Name": ["My Camp", "My Camp"],
+            "Ad Set Name": ["AS 1", "AS 2"],
+            "Link": ["https://example.com", "https://example.com"],
+            "URL Tags": [
+                "utm_source=fb&utm_campaign={campaign_name}",
+                "utm_source=fb&utm_campaign={campaign_name}&utm_content={adset_name}",
+            ],
+        })
+        output_df, errors_df = transform(df)
+        self.assertTrue(errors_df.empty)
+        self.assertEqual(
+            output_df["URL Tags"].tolist(),
+            [
+                "utm_source=fb&utm_campaign=my_camp",
+                "utm_source=fb&utm_campaign=my_camp&utm_content=as_2",
+            ],
+        )
+
+    def test_single_adset_row(self):
+        df = pd.DataFrame({
+            "Input Level": ["adset"],
+            "Campaign Name": ["My Camp"],
+            "Ad Set Name": ["AS 1"],
+            "Link": ["https://example.com"],
+            "URL Tags": ["utm_source=fb&utm_campaign={campaign_name}"],
+        })
+        output_df, errors_df = transform(df)
+        self.assertTrue(errors_df.empty)
+        self.assertEqual(output_df["URL Tags"].tolist(), ["utm_source=fb&utm_campaign=my_camp"])
+
+
+def _adsets(n: int, **cols) -> pd.DataFrame:
+    """n adset rows under one campaign, with the given extra columns."""
+    return pd.DataFrame({
+        "Input Level": ["adset"] * n,
+        "Campaign Name": ["My Camp"] * n,
+        "Ad Set Name": [f"AS {i + 1}" for i in range(n)],
+        **cols,
+    })
+
+
+class TransformBehaviourTest(unittest.TestCase):
+    def test_blank_cells_never_leak_nan(self):
+        df = pd.DataFrame({
+            "Input Level": ["campaign", "adset"],
+            "Campaign Name": ["My Camp", None],
+            "Campaign Objective": ["Sales", None],
+            "Ad Set Name": [None, "AS 1"],
+            "Description": [None, None],
+            "Age Min": [None, None],
+        })
+        output_df, errors_df = transform(df)
+        self.assertTrue(errors_df.empty)
+        self.assertFalse(output_df.isin(["nan", "None", "<NA>"]).any().any())
+        adset = output_df.iloc[1]
+        self.assertEqual(adset["Campaign Name"], "My Camp")
+        self.assertEqual(adset["Optimisation Goal"], "VALUE")
+        self.assertEqual(adset["Call to Action"], "SHOP_NOW")
+        self.assertEqual(adset["Description"], "")
+        self.assertEqual((adset["Age Min"], adset["Age Max"]), ("13", "65"))
+
+    def test_ages_clamped_at_both_ends(self):
+        df = _adsets(3, **{
+            "Age Min": ["10", "10", "30"],
+            "Age Max": ["70", "", ""],
+            "Special Ad Categories": ["", "HOUSING", ""],
+        })
+        output_df, errors_df = transform(df)
+        self.assertTrue(errors_df.empty)
+        self.assertEqual(
+            output_df[["Age Min", "Age Max"]].values.tolist(),
+            [["13", "65"], ["18", "65"], ["30", "65"]],
+        )
+
+    def test_adset_budget_wins_and_campaign_budget_is_not_checked(self):
+        df = _adsets(1, **{"Campaign Daily Budget": ["abc"], "Ad Set Daily Budget": ["50"]})
+        output_df, errors_df = transform(df)
+        self.assertTrue(errors_df.empty)
+        self.assertEqual(output_df[["Campaign Daily Budget", "Ad Set Daily Budget"]].values.tolist(), [["", "50"]])
+
+    def test_gender_accepts_single_letters(self):
+        output_df, errors_df = transform(_adsets(4, Gender=["m", "F", "", "x"]))
+        self.assertEqual(output_df["Gender"].tolist(), ["Male", "Female", "All"])
+        self.assertEqual(errors_df["row"].tolist(), [5])
+
+    def test_url_tags_need_a_utm_pair(self):
+        df = _adsets(3, Link=["https://example.com"] * 3, **{
+            "URL Tags": ["source=meta", "utm_source=meta", "see utm_ docs"],
+        })
+        output_df, errors_df = transform(df)
+        self.assertEqual(output_df["URL Tags"].tolist(), ["utm_source=meta"])
+        self.assertEqual(errors_df["row"].tolist(), [2, 4])
+        self.assertTrue(errors_df["error"].str.startswith("Invalid UTM format").all())
+
+    def test_every_failing_check_is_reported(self):
+        # The row-by-row baseline stopped at the first failure; now each check reports
+        df = _adsets(1, **{"Campaign Status": ["BOGUS"], "Ad Set Daily Budget": ["-5"], "Gender": ["x"]})
+        output_df, errors_df = transform(df)
+        self.assertTrue(output_df.empty)
+        self.assertEqual(errors_df["row"].tolist(), [2, 2, 2])
+        self.assertEqual(
+            [msg.split(":")[0] for msg in errors_df["error"]],
+            ["Campaign Status", "Invalid positive number", "Gender"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()